@@ -13,179 +13,288 @@ This script provides various methods to automatically rename files in a folder:
 select the file renaming method and options via command line prompts.
 It also includes a preview of changes before execution.
 
+For scripted use, pass the folder and operation as arguments, e.g.:
+    python_file_rename.py --folder photos --operation sequential --base-name trip --yes
+
 """
 
+import argparse
+import functools
+import inspect
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
+# Characters kept by remove_special: alphanumeric, whitespace, hyphens, underscores
+_SPECIAL_RE = re.compile(r'[^a-zA-Z0-9\s\-_]')
+
+# change_case options, resolved once per call rather than per file
+_CASE_OPS = {
+    "lower": str.lower,
+    "upper": str.upper,
+    "title": str.title,
+    "capitalize": str.capitalize,
+}
+
+def _freeze(value):
+    """Make a method argument hashable for use in a cache key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+def _rename_operation(cacheable=True):
+    """Turn a method that computes changes into a rename operation with preview/execute.
+    
+    The decorated method gains a trailing preview parameter (positional or
+    keyword, shown in help()): preview=True prints and returns the changes,
+    preview=False executes them. The changes from the most recent call are
+    memoized and reused when the same method is called with the same
+    arguments while the folder's st_mtime_ns is unchanged. That key is only as
+    good as the filesystem's timestamps: FAT/exFAT record mtime in 2-second
+    steps and NFS/SMB clients may cache it, so a change made by another program
+    shortly after a preview can go unnoticed there. Renames done by this class
+    always clear the cache.
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+        preview_param = inspect.Parameter("preview", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=True)
+        signature = signature.replace(parameters=[*signature.parameters.values(), preview_param])
+        
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            self = arguments.pop("self")
+            preview = arguments.pop("preview")
+            
+            if cacheable:
+                # Bound arguments, so positional and keyword calls share an entry
+                key = (method.__name__, _freeze(sorted(arguments.items())))
+                mtime = os.stat(self.folder_path).st_mtime_ns
+                if self._cache is not None and self._cache[:2] == (key, mtime):
+                    changes = list(self._cache[2])
+                else:
+                    changes = method(self, **arguments)
+                    # Only the latest result is kept, so memory stays bounded
+                    self._cache = (key, mtime, tuple(changes))
+            else:
+                changes = method(self, **arguments)
+            
+            if preview:
+                self._preview_changes(changes)
+                return changes
+            else:
+                return self._execute_changes(changes)
+        wrapper.__signature__ = signature
+        return wrapper
+    return decorator
+
+def _path_sort_key(item):
+    """Sort key for (path, ...) tuples: by path, ignoring case on Windows like PureWindowsPath ordering."""
+    return os.path.normcase(item[0])
+
+def _split_name(name):
+    """Split a file name into (stem, suffix) like Path.stem/Path.suffix.
+    
+    Unlike os.path.splitext, a trailing dot stays in the stem:
+    
+    >>> _split_name("a."), _split_name("..a"), _split_name(".bashrc"), _split_name("x.tar.gz")
+    (('a.', ''), ('.', '.a'), ('.bashrc', ''), ('x.tar', '.gz'))
+    """
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[:i], name[i:]
+    return name, ""
+
+def _is_case_insensitive(folder_path, names):
+    """Probe whether the filesystem holding folder_path ignores case in file names.
+    
+    A folder listing both spellings of a name is case-sensitive, and that is
+    decided without touching the disk:
+    
+    >>> _is_case_insensitive(".", {"a", "A"})
+    False
+    
+    Names whose case does not round-trip (such as "ß" -> "SS") cannot be
+    probed; with nothing to probe the stricter case-insensitive answer is used:
+    
+    >>> _is_case_insensitive(".", {"ß", "123"})
+    True
+    """
+    for name in names:
+        swapped = name.swapcase()
+        if swapped == name or len(swapped) != len(name) or swapped.swapcase() != name:
+            continue
+        if swapped in names:
+            return False
+        return os.path.exists(os.path.join(folder_path, swapped))
+    # Nothing to probe with; fall back to the stricter case-insensitive comparison
+    return True
+
 class FileRenamer:
     def __init__(self, folder_path):
         self.folder_path = Path(folder_path)
         if not self.folder_path.exists():
             raise ValueError(f"Folder does not exist: {folder_path}")
+        # (method name and arguments, folder mtime_ns, changes) of the last computed operation
+        self._cache = None
+        # (old_path, new_path, error) for each rename the last execution could not make
+        self.failed = []
+    
+    def iter_files(self, extensions=None):
+        """Yield (path, stem, suffix) tuples for files in folder in directory order, optionally filtered by extensions.
+        
+        Paths are plain strings; os.rename and os.path accept them directly.
+        """
+        if extensions is not None:
+            extensions = tuple(sys.intern(ext.lower()) for ext in extensions)
+        with os.scandir(self.folder_path) as it:
+            for entry in it:
+                # DirEntry caches the file type; only symlinks need a stat to follow
+                if not entry.is_file():
+                    continue
+                # Cheap endswith rejects most non-matching names before any splitting
+                if extensions is not None and not entry.name.lower().endswith(extensions):
+                    continue
+                stem, extension = _split_name(entry.name)
+                # Extensions repeat across a folder; interning shares one string per distinct suffix
+                extension = sys.intern(extension)
+                # endswith alone would also accept a bare ".jpg" name whose suffix is empty
+                if extensions is None or sys.intern(extension.lower()) in extensions:
+                    yield entry.path, stem, extension
     
     def get_files(self, extensions=None):
-        """Get list of files in folder, optionally filtered by extensions."""
-        files = []
-        for file in self.folder_path.iterdir():
-            if file.is_file():
-                if extensions is None or file.suffix.lower() in extensions:
-                    files.append(file)
-        return sorted(files)
+        """Get sorted list of (path, stem, suffix) tuples for files in folder, optionally filtered by extensions."""
+        files = list(self.iter_files(extensions))
+        files.sort(key=_path_sort_key)
+        return files
     
-    def add_prefix_suffix(self, prefix="", suffix="", extensions=None, preview=True):
+    @_rename_operation()
+    def add_prefix_suffix(self, prefix="", suffix="", extensions=None):
         """Add prefix and/or suffix to filenames."""
-        files = self.get_files(extensions)
         changes = []
+        parent_str = os.path.join(self.folder_path, "")
         
-        for file in files:
-            name_without_ext = file.stem
-            extension = file.suffix
+        for file, name_without_ext, extension in self.iter_files(extensions):
             new_name = f"{prefix}{name_without_ext}{suffix}{extension}"
-            new_path = file.parent / new_name
+            new_path = parent_str + new_name
             
             changes.append((file, new_path))
         
-        if preview:
-            self._preview_changes(changes)
-            return changes
-        else:
-            return self._execute_changes(changes)
+        changes.sort(key=_path_sort_key)
+        return changes
     
-    def sequential_rename(self, base_name="file", start_num=1, padding=3, extensions=None, preview=True):
+    @_rename_operation()
+    def sequential_rename(self, base_name="file", start_num=1, padding=3, extensions=None):
         """Rename files with sequential numbers."""
         files = self.get_files(extensions)
         changes = []
+        parent_str = os.path.join(self.folder_path, "")
         
-        for i, file in enumerate(files):
-            extension = file.suffix
+        for i, (file, _, extension) in enumerate(files):
             number = str(start_num + i).zfill(padding)
             new_name = f"{base_name}_{number}{extension}"
-            new_path = file.parent / new_name
+            new_path = parent_str + new_name
             
             changes.append((file, new_path))
         
-        if preview:
-            self._preview_changes(changes)
-            return changes
-        else:
-            return self._execute_changes(changes)
+        return changes
     
-    def replace_text(self, old_text, new_text, case_sensitive=True, extensions=None, preview=True):
+    @_rename_operation()
+    def replace_text(self, old_text, new_text, case_sensitive=True, extensions=None):
         """Replace text in filenames."""
-        files = self.get_files(extensions)
         changes = []
+        parent_str = os.path.join(self.folder_path, "")
+        pattern = None if case_sensitive else re.compile(re.escape(old_text), re.IGNORECASE)
         
-        for file in files:
-            name_without_ext = file.stem
-            extension = file.suffix
+        for file, name_without_ext, extension in self.iter_files(extensions):
             
             if case_sensitive:
                 new_name_stem = name_without_ext.replace(old_text, new_text)
             else:
-                new_name_stem = re.sub(re.escape(old_text), new_text, name_without_ext, flags=re.IGNORECASE)
+                new_name_stem = pattern.sub(new_text, name_without_ext)
             
             if new_name_stem != name_without_ext:  # Only if there was a change
                 new_name = f"{new_name_stem}{extension}"
-                new_path = file.parent / new_name
+                new_path = parent_str + new_name
                 changes.append((file, new_path))
         
-        if preview:
-            self._preview_changes(changes)
-            return changes
-        else:
-            return self._execute_changes(changes)
+        changes.sort(key=_path_sort_key)
+        return changes
     
-    def change_case(self, case_type="lower", extensions=None, preview=True):
+    @_rename_operation()
+    def change_case(self, case_type="lower", extensions=None):
         """Change case of filenames. Options: 'lower', 'upper', 'title', 'capitalize'"""
-        files = self.get_files(extensions)
         changes = []
+        parent_str = os.path.join(self.folder_path, "")
+        op = _CASE_OPS.get(case_type)
+        # An unknown case type changes nothing
+        files = self.iter_files(extensions) if op is not None else ()
         
-        for file in files:
-            name_without_ext = file.stem
-            extension = file.suffix
-            
-            if case_type == "lower":
-                new_name_stem = name_without_ext.lower()
-            elif case_type == "upper":
-                new_name_stem = name_without_ext.upper()
-            elif case_type == "title":
-                new_name_stem = name_without_ext.title()
-            elif case_type == "capitalize":
-                new_name_stem = name_without_ext.capitalize()
-            else:
-                continue
+        for file, name_without_ext, extension in files:
+            new_name_stem = op(name_without_ext)
             
             if new_name_stem != name_without_ext:
                 new_name = f"{new_name_stem}{extension}"
-                new_path = file.parent / new_name
+                new_path = parent_str + new_name
                 changes.append((file, new_path))
         
-        if preview:
-            self._preview_changes(changes)
-            return changes
-        else:
-            return self._execute_changes(changes)
+        changes.sort(key=_path_sort_key)
+        return changes
     
-    def remove_characters(self, chars_to_remove="", remove_spaces=False, remove_special=False, extensions=None, preview=True):
+    @_rename_operation()
+    def remove_characters(self, chars_to_remove="", remove_spaces=False, remove_special=False, extensions=None):
         """Remove specified characters from filenames."""
-        files = self.get_files(extensions)
         changes = []
+        parent_str = os.path.join(self.folder_path, "")
+        # Remove specific characters and replace spaces in a single pass;
+        # deletions take precedence, so a space in chars_to_remove is dropped
+        trans = str.maketrans(" " if remove_spaces else "", "_" if remove_spaces else "", chars_to_remove)
         
-        for file in files:
-            name_without_ext = file.stem
-            extension = file.suffix
-            new_name_stem = name_without_ext
-            
-            # Remove specific characters
-            if chars_to_remove:
-                for char in chars_to_remove:
-                    new_name_stem = new_name_stem.replace(char, "")
-            
-            # Remove spaces
-            if remove_spaces:
-                new_name_stem = new_name_stem.replace(" ", "_")
+        for file, name_without_ext, extension in self.iter_files(extensions):
+            new_name_stem = name_without_ext.translate(trans)
             
             # Remove special characters (keep only alphanumeric, spaces, hyphens, underscores)
             if remove_special:
-                new_name_stem = re.sub(r'[^a-zA-Z0-9\s\-_]', '', new_name_stem)
+                new_name_stem = _SPECIAL_RE.sub('', new_name_stem)
             
             if new_name_stem != name_without_ext:
                 new_name = f"{new_name_stem}{extension}"
-                new_path = file.parent / new_name
+                new_path = parent_str + new_name
                 changes.append((file, new_path))
         
-        if preview:
-            self._preview_changes(changes)
-            return changes
-        else:
-            return self._execute_changes(changes)
+        changes.sort(key=_path_sort_key)
+        return changes
     
-    def add_timestamp(self, timestamp_format="%Y%m%d", position="prefix", extensions=None, preview=True):
+    # The timestamp comes from the clock, so results cannot be reused
+    @_rename_operation(cacheable=False)
+    def add_timestamp(self, timestamp_format="%Y%m%d", position="prefix", extensions=None):
         """Add timestamp to filenames."""
-        files = self.get_files(extensions)
         changes = []
+        parent_str = os.path.join(self.folder_path, "")
         timestamp = datetime.now().strftime(timestamp_format)
+        if position == "prefix":
+            prefix_str, suffix_str = f"{timestamp}_", ""
+        else:  # suffix
+            prefix_str, suffix_str = "", f"_{timestamp}"
         
-        for file in files:
-            name_without_ext = file.stem
-            extension = file.suffix
-            
-            if position == "prefix":
-                new_name = f"{timestamp}_{name_without_ext}{extension}"
-            else:  # suffix
-                new_name = f"{name_without_ext}_{timestamp}{extension}"
-            
-            new_path = file.parent / new_name
+        for file, name_without_ext, extension in self.iter_files(extensions):
+            new_name = prefix_str + name_without_ext + suffix_str + extension
+            new_path = parent_str + new_name
             changes.append((file, new_path))
         
-        if preview:
-            self._preview_changes(changes)
-            return changes
-        else:
-            return self._execute_changes(changes)
+        changes.sort(key=_path_sort_key)
+        return changes
+    
+    def commit(self, changes, parallel=False):
+        """Execute changes previously returned by a preview call."""
+        return self._execute_changes(changes, parallel=parallel)
     
     def _preview_changes(self, changes):
         """Preview the changes that would be made."""
@@ -195,48 +304,302 @@ class FileRenamer:
         
         print(f"\nPreview of changes ({len(changes)} files):")
         print("-" * 80)
-        for old_path, new_path in changes:
-            print(f"'{old_path.name}' → '{new_path.name}'")
+        sys.stdout.write("\n".join(f"'{os.path.basename(old_path)}' → '{os.path.basename(new_path)}'" for old_path, new_path in changes) + "\n")
         print("-" * 80)
     
-    def _execute_changes(self, changes):
-        """Execute the renaming changes."""
+    def _do_rename(self, old_path, new_path, existing, key):
+        """Rename a single file. Returns (old_path, new_path, error) with error None on success."""
+        try:
+            if key(os.path.basename(new_path)) in existing:
+                return old_path, new_path, "Target file already exists"
+            os.rename(old_path, new_path)
+            existing.discard(key(os.path.basename(old_path)))
+            existing.add(key(os.path.basename(new_path)))
+            return old_path, new_path, None
+        except Exception as e:
+            return old_path, new_path, str(e)
+    
+    def _validate_changes(self, changes, existing, key):
+        """Check a batch of changes for collisions and order it so it can run without clobbering.
+        
+        Names are compared through key, which folds case on case-insensitive
+        filesystems; existing holds the folder's names already passed through
+        key. Raises ValueError if two files would get the same name or a target
+        is an existing file that is not itself being renamed. Returns
+        (ordered, temps): the renames in a safe order, with cycles (a→b, b→a)
+        broken through a temporary name, and a dict mapping each temporary path
+        to its original path.
+        
+        Chains run from the end, cycles go through a temporary name:
+        
+        >>> renamer = FileRenamer(".")
+        >>> renamer._validate_changes([("f1", "f2"), ("f2", "f3")], {"f1", "f2"}, str)
+        ([('f2', 'f3'), ('f1', 'f2')], {})
+        >>> ordered, temps = renamer._validate_changes([("a", "b"), ("b", "c"), ("c", "a")], {"a", "b", "c"}, str)
+        >>> ordered
+        [('a', 'a.rename-tmp0'), ('c', 'a'), ('b', 'c'), ('a.rename-tmp0', 'b')]
+        >>> temps
+        {'a.rename-tmp0': 'a'}
+        
+        Collisions are rejected before anything is renamed:
+        
+        >>> renamer._validate_changes([("a", "x"), ("b", "X")], {"a", "b"}, str.casefold)
+        Traceback (most recent call last):
+            ...
+        ValueError: Multiple files would be renamed to: X, x
+        >>> renamer._validate_changes([("a", "B")], {"a", "b"}, str.casefold)
+        Traceback (most recent call last):
+            ...
+        ValueError: Target files already exist: B
+        """
+        named = []
+        for old_path, new_path in changes:
+            old_name, new_name = os.path.basename(old_path), os.path.basename(new_path)
+            # Renaming a file to its own name is a no-op
+            if old_name != new_name:
+                named.append((key(old_name), key(new_name), new_name, old_path, new_path))
+        
+        new_keys = [new_key for _, new_key, _, _, _ in named]
+        if len(set(new_keys)) != len(new_keys):
+            seen = set()
+            duplicate_keys = {new_key for new_key in new_keys if new_key in seen or seen.add(new_key)}
+            duplicates = sorted({new_name for _, new_key, new_name, _, _ in named if new_key in duplicate_keys})
+            raise ValueError(f"Multiple files would be renamed to: {', '.join(duplicates)}")
+        
+        pending = {old_key: (old_path, new_path) for old_key, _, _, old_path, new_path in named}
+        conflicts = sorted(new_name for _, new_key, new_name, _, _ in named
+                           if new_key in existing and new_key not in pending)
+        if conflicts:
+            raise ValueError(f"Target files already exist: {', '.join(conflicts)}")
+        
+        # Each file has at most one rename into its name, so the batch is a set of
+        # chains and cycles. A rename is ready once nothing still occupies its target.
+        by_target = {new_key: old_key for old_key, new_key, _, _, _ in named}
+        ready = [old_key for old_key, new_key, _, _, _ in named if new_key not in pending]
+        taken = existing | set(new_keys)
+        ordered = []
+        temps = {}
+        
+        while pending:
+            if ready:
+                name = ready.pop()
+                old_path, new_path = pending.pop(name)
+                ordered.append((old_path, new_path))
+            else:
+                # Only cycles remain: move one file aside to break the cycle
+                name, (old_path, new_path) = next(iter(pending.items()))
+                old_name = os.path.basename(old_path)
+                n = 0
+                while key(f"{old_name}.rename-tmp{n}") in taken:
+                    n += 1
+                temp_name = f"{old_name}.rename-tmp{n}"
+                temp_path = os.path.join(os.path.dirname(old_path), temp_name)
+                taken.add(key(temp_name))
+                ordered.append((old_path, temp_path))
+                temps[temp_path] = temps.get(old_path, old_path)
+                del pending[name]
+                pending[key(temp_name)] = (temp_path, new_path)
+                by_target[key(os.path.basename(new_path))] = key(temp_name)
+            
+            # The rename that targets the name just freed can now run
+            blocked = by_target.get(name)
+            if blocked in pending:
+                ready.append(blocked)
+        
+        return ordered, temps
+    
+    def _execute_changes(self, changes, parallel=False):
+        """Execute the renaming changes.
+        
+        The whole batch is validated first, so a collision aborts before any file
+        is touched. With parallel=True independent renames are issued from a thread
+        pool, which helps on high-latency (network) filesystems; results are then in
+        completion order. Batches that rename files onto each other's names run serially.
+        """
+        self.failed = []
         if not changes:
             print("No files to rename.")
             return []
         
         successful = []
         failed = []
+        # One directory listing instead of a stat per target
+        with os.scandir(self.folder_path) as it:
+            names = {entry.name for entry in it}
+        key = str.casefold if _is_case_insensitive(self.folder_path, names) else str
+        existing = {key(name) for name in names}
         
-        for old_path, new_path in changes:
-            try:
-                if new_path.exists():
-                    print(f"Warning: '{new_path.name}' already exists, skipping '{old_path.name}'")
-                    failed.append((old_path, new_path, "Target file already exists"))
-                else:
-                    old_path.rename(new_path)
-                    successful.append((old_path, new_path))
-            except Exception as e:
-                failed.append((old_path, new_path, str(e)))
+        try:
+            ordered, temps = self._validate_changes(changes, existing, key)
+        except ValueError as e:
+            print(f"Error: {e}")
+            print("No files were renamed.")
+            self.failed = [(old_path, new_path, str(e)) for old_path, new_path in changes]
+            return []
+        if not ordered:
+            # Every change was a no-op rename
+            print("No files to rename.")
+            return []
+        
+        sources = {key(os.path.basename(old_path)) for old_path, _ in ordered}
+        if parallel and not any(key(os.path.basename(new_path)) in sources for _, new_path in ordered):
+            with ThreadPoolExecutor(max_workers=min(32, len(ordered))) as executor:
+                futures = [executor.submit(self._do_rename, old_path, new_path, existing, key) for old_path, new_path in ordered]
+                results = [future.result() for future in as_completed(futures)]
+        else:
+            results = (self._do_rename(old_path, new_path, existing, key) for old_path, new_path in ordered)
+        
+        for old_path, new_path, error in results:
+            if error is None:
+                if new_path in temps:
+                    continue  # first half of a cycle-breaking rename
+                successful.append((temps.get(old_path, old_path), new_path))
+            else:
+                if error == "Target file already exists":
+                    print(f"Warning: '{os.path.basename(new_path)}' already exists, skipping '{os.path.basename(old_path)}'")
+                failed.append((old_path, new_path, error))
+        
+        if successful:
+            # The folder changed, so previously computed changes are stale
+            self._cache = None
         
         print(f"\nRenaming complete:")
         print(f"✓ Successfully renamed: {len(successful)} files")
         if failed:
             print(f"✗ Failed to rename: {len(failed)} files")
-            for old_path, new_path, error in failed:
-                print(f"  '{old_path.name}' → '{new_path.name}': {error}")
+            sys.stdout.write("\n".join(f"  '{os.path.basename(old_path)}' → '{os.path.basename(new_path)}': {error}" for old_path, new_path, error in failed) + "\n")
         
+        self.failed = failed
         return successful
 
-def main():
-    """Example usage of the FileRenamer class."""
+# --operation name -> FileRenamer method
+_OPERATIONS = {
+    "prefix-suffix": "add_prefix_suffix",
+    "sequential": "sequential_rename",
+    "replace": "replace_text",
+    "case": "change_case",
+    "remove": "remove_characters",
+    "timestamp": "add_timestamp",
+}
+
+# --operation name -> destinations of the operation options it uses
+_OPERATION_OPTIONS = {
+    "prefix-suffix": {"prefix", "suffix"},
+    "sequential": {"base_name", "start", "padding"},
+    "replace": {"old", "new", "ignore_case"},
+    "case": {"case"},
+    "remove": {"chars", "spaces", "special"},
+    "timestamp": {"format", "position"},
+    "list": set(),
+}
+
+def _parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Rename files in a folder. Runs the interactive menu unless --operation is given.")
+    parser.add_argument("--folder", help="folder containing the files to rename")
+    parser.add_argument("--operation", choices=list(_OPERATIONS) + ["list"],
+                        help="run a single operation and exit")
+    parser.add_argument("-y", "--yes", action="store_true",
+                        help="execute without previewing or asking for confirmation")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only preview the changes, never execute them")
+    
+    options = parser.add_argument_group("operation options")
+    operation_options = []
+    
+    def option(*flags, **kwargs):
+        operation_options.append(options.add_argument(*flags, **kwargs))
+    
+    option("--prefix", default="", help="prefix-suffix: text to add before the name")
+    option("--suffix", default="", help="prefix-suffix: text to add after the name")
+    option("--base-name", default="file", help="sequential: base name (default: file)")
+    option("--start", type=int, default=1, help="sequential: starting number (default: 1)")
+    option("--padding", type=int, default=3, help="sequential: number padding (default: 3)")
+    option("--old", help="replace: text to replace")
+    option("--new", default="", help="replace: replacement text")
+    option("--ignore-case", action="store_true", help="replace: match case-insensitively")
+    option("--case", choices=list(_CASE_OPS), default="lower", help="case: case type (default: lower)")
+    option("--chars", default="", help="remove: characters to remove")
+    option("--spaces", action="store_true", help="remove: replace spaces with underscores")
+    option("--special", action="store_true", help="remove: remove special characters")
+    option("--format", default="%Y%m%d", help="timestamp: strftime format (default: %%Y%%m%%d)")
+    option("--position", choices=["prefix", "suffix"], default="prefix",
+           help="timestamp: where to add the timestamp (default: prefix)")
+    
+    args = parser.parse_args(argv)
+    given = [action for action in operation_options if getattr(args, action.dest) != action.default]
+    if not args.operation:
+        # Interactive runs always preview and ask before renaming
+        if args.yes:
+            parser.error("--yes requires --operation")
+        if given:
+            parser.error(f"{', '.join(action.option_strings[0] for action in given)}: operation options need --operation")
+    else:
+        unused = [action.option_strings[0] for action in given if action.dest not in _OPERATION_OPTIONS[args.operation]]
+        if unused:
+            parser.error(f"{', '.join(unused)}: not used by --operation {args.operation}")
+    if args.operation == "replace" and not args.old:
+        parser.error("--operation replace requires --old")
+    return args
+
+def _operation_kwargs(args):
+    """Build the FileRenamer method arguments for --operation from the parsed arguments."""
+    if args.operation == "prefix-suffix":
+        return dict(prefix=args.prefix, suffix=args.suffix)
+    elif args.operation == "sequential":
+        return dict(base_name=args.base_name, start_num=args.start, padding=args.padding)
+    elif args.operation == "replace":
+        return dict(old_text=args.old, new_text=args.new, case_sensitive=not args.ignore_case)
+    elif args.operation == "case":
+        return dict(case_type=args.case)
+    elif args.operation == "remove":
+        return dict(chars_to_remove=args.chars, remove_spaces=args.spaces, remove_special=args.special)
+    else:  # timestamp
+        return dict(timestamp_format=args.format, position=args.position)
+
+def _run_operation(renamer, method_name, kwargs, assume_yes=False, dry_run=False):
+    """Preview, confirm and execute a rename operation, computing the changes only once."""
+    operation = getattr(renamer, method_name)
+    if assume_yes and not dry_run:
+        return operation(preview=False, **kwargs)
+    
+    changes = operation(preview=True, **kwargs)
+    if changes and not dry_run and input("\nExecute these changes? (y/N): ").lower() == 'y':
+        return renamer.commit(changes)
+    return []
+
+def _list_files(renamer, folder_path):
+    """Print the files in the folder."""
+    files = renamer.get_files()
+    print(f"\nFiles in '{folder_path}' ({len(files)} total):")
+    sys.stdout.write("".join(f"{i:3d}. {os.path.basename(file)}\n" for i, (file, _, _) in enumerate(files, 1)))
+
+def main(argv=None):
+    """Example usage of the FileRenamer class.
+    
+    Returns the exit status: non-zero when an --operation run hits an error or
+    leaves any file unrenamed.
+    """
+    args = _parse_args(argv)
     
     # Get folder path from user
-    folder_path = input("Enter the folder path: ").strip().strip('"')
+    folder_path = args.folder or input("Enter the folder path: ").strip().strip('"')
     
     try:
         renamer = FileRenamer(folder_path)
         
+        if args.operation == "list":
+            _list_files(renamer, folder_path)
+            return 0
+        elif args.operation:
+            _run_operation(renamer, _OPERATIONS[args.operation], _operation_kwargs(args),
+                           assume_yes=args.yes, dry_run=args.dry_run)
+            return 1 if renamer.failed else 0
+        
+        # The interactive menu never skips the preview and confirmation
+        run = functools.partial(_run_operation, renamer, dry_run=args.dry_run)
+        
         while True:
             print("\n" + "="*50)
             print("File Renaming Options:")
@@ -256,66 +619,52 @@ def main():
             elif choice == "1":
                 prefix = input("Enter prefix (or press Enter for none): ").strip()
                 suffix = input("Enter suffix (or press Enter for none): ").strip()
-                changes = renamer.add_prefix_suffix(prefix=prefix, suffix=suffix, preview=True)
-                if changes and input("\nExecute these changes? (y/N): ").lower() == 'y':
-                    renamer.add_prefix_suffix(prefix=prefix, suffix=suffix, preview=False)
+                run("add_prefix_suffix", dict(prefix=prefix, suffix=suffix))
                     
             elif choice == "2":
                 base_name = input("Enter base name (default: 'file'): ").strip() or "file"
                 start_num = int(input("Enter starting number (default: 1): ").strip() or "1")
                 padding = int(input("Enter number padding (default: 3): ").strip() or "3")
-                changes = renamer.sequential_rename(base_name=base_name, start_num=start_num, padding=padding, preview=True)
-                if changes and input("\nExecute these changes? (y/N): ").lower() == 'y':
-                    renamer.sequential_rename(base_name=base_name, start_num=start_num, padding=padding, preview=False)
+                run("sequential_rename", dict(base_name=base_name, start_num=start_num, padding=padding))
                     
             elif choice == "3":
                 old_text = input("Enter text to replace: ").strip()
                 new_text = input("Enter replacement text: ").strip()
                 case_sensitive = input("Case sensitive? (Y/n): ").lower() != 'n'
-                changes = renamer.replace_text(old_text, new_text, case_sensitive=case_sensitive, preview=True)
-                if changes and input("\nExecute these changes? (y/N): ").lower() == 'y':
-                    renamer.replace_text(old_text, new_text, case_sensitive=case_sensitive, preview=False)
+                run("replace_text", dict(old_text=old_text, new_text=new_text, case_sensitive=case_sensitive))
                     
             elif choice == "4":
                 print("Case options: lower, upper, title, capitalize")
                 case_type = input("Enter case type: ").strip().lower()
-                changes = renamer.change_case(case_type=case_type, preview=True)
-                if changes and input("\nExecute these changes? (y/N): ").lower() == 'y':
-                    renamer.change_case(case_type=case_type, preview=False)
+                run("change_case", dict(case_type=case_type))
                     
             elif choice == "5":
                 chars_to_remove = input("Enter characters to remove: ").strip()
                 remove_spaces = input("Replace spaces with underscores? (y/N): ").lower() == 'y'
                 remove_special = input("Remove special characters? (y/N): ").lower() == 'y'
-                changes = renamer.remove_characters(chars_to_remove=chars_to_remove, 
-                                                 remove_spaces=remove_spaces, 
-                                                 remove_special=remove_special, preview=True)
-                if changes and input("\nExecute these changes? (y/N): ").lower() == 'y':
-                    renamer.remove_characters(chars_to_remove=chars_to_remove, 
-                                            remove_spaces=remove_spaces, 
-                                            remove_special=remove_special, preview=False)
+                run("remove_characters", dict(chars_to_remove=chars_to_remove, 
+                                              remove_spaces=remove_spaces, 
+                                              remove_special=remove_special))
                     
             elif choice == "6":
                 print("Format examples: %Y%m%d (20231215), %Y-%m-%d (2023-12-15), %H%M%S (143052)")
                 timestamp_format = input("Enter timestamp format (default: %Y%m%d): ").strip() or "%Y%m%d"
                 position = input("Position - prefix or suffix? (default: prefix): ").strip().lower() or "prefix"
-                changes = renamer.add_timestamp(timestamp_format=timestamp_format, position=position, preview=True)
-                if changes and input("\nExecute these changes? (y/N): ").lower() == 'y':
-                    renamer.add_timestamp(timestamp_format=timestamp_format, position=position, preview=False)
+                run("add_timestamp", dict(timestamp_format=timestamp_format, position=position))
                     
             elif choice == "7":
-                files = renamer.get_files()
-                print(f"\nFiles in '{folder_path}' ({len(files)} total):")
-                for i, file in enumerate(files, 1):
-                    print(f"{i:3d}. {file.name}")
+                _list_files(renamer, folder_path)
             
             else:
                 print("Invalid option. Please try again.")
     
     except ValueError as e:
         print(f"Error: {e}")
+        return 1 if args.operation else 0
     except KeyboardInterrupt:
         print("\nOperation cancelled.")
+        return 130 if args.operation else 0
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())